@@ -2,22 +2,36 @@ import argparse
 import json
 
 import os
-from distutils import dir_util
+import shutil
+from typing import Tuple
+
+from PIL import Image
 
 from omrdatasettools.Downloader import Downloader
 from omrdatasettools.AudiverisOmrImageGenerator import AudiverisOmrImageGenerator
 from omrdatasettools.OmrDataset import OmrDataset
 
+import ImageResizer
+
 
 class AudiverisOmrImageExtractor():
     def __init__(self) -> None:
         self.path_of_this_file = os.path.dirname(os.path.realpath(__file__))
 
-    def prepare_dataset(self, intermediate_image_directory, image_dataset_directory):
+    def prepare_dataset(self, intermediate_image_directory, image_dataset_directory,
+                        target_size: Tuple[int, int] = None):
+        """
+        Copies the images of all classes that are not ignored into the respective class folders of the
+        image_dataset_directory.
+
+        :param target_size: Optional (width, height) to which the images are resized while copying them, so they
+                            don't have to be rewritten by a subsequent resizing step
+        """
         with open(os.path.join(self.path_of_this_file, "AudiverisOmrIgnoredClasses.json")) as file:
             ignored_classes = json.load(file)
         with open(os.path.join(self.path_of_this_file, "AudiverisOmrClassNameMapping.json")) as file:
             class_name_mapping = json.load(file)
+        image_resizer = ImageResizer.ImageResizer()
 
         image_directories = os.listdir(intermediate_image_directory)
 
@@ -29,7 +43,11 @@ class AudiverisOmrImageExtractor():
             source_folder = os.path.join(intermediate_image_directory, symbol_class)
             destination_folder = os.path.join(image_dataset_directory, destination_class_name)
             os.makedirs(destination_folder, exist_ok=True)
-            dir_util.copy_tree(source_folder, destination_folder)
+            if target_size is None:
+                shutil.copytree(source_folder, destination_folder, dirs_exist_ok=True)
+            else:
+                image_resizer.resize_all_images_into(source_folder, destination_folder, target_size[0],
+                                                     target_size[1], Image.LANCZOS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+import argparse
+import io
+import json
+import os
+import random
+import tarfile
+from typing import List, Optional
+
+from tqdm import tqdm
+
+
+class DatasetShardWriter:
+    """
+    Class for packing a dataset with one sub-folder per class into tar-shards that follow the WebDataset convention,
+    so a training can read the samples sequentially instead of opening one file per sample.
+    """
+
+    def write_shards(self, image_dataset_directory: str, shard_directory: str, class_names: Optional[List[str]] = None,
+                     maximum_shard_size: int = 1_000_000_000, seed: int = 0) -> None:
+        """
+        Writes all *.png images of the class sub-folders into the shards shard-000000.tar, shard-000001.tar, ...
+        Each sample is stored as <class>/<name>.png together with <class>/<name>.cls, that contains the index of the
+        class as integer, and <class>/<name>.txt, that contains the class name. Dots in the name are percent-encoded.
+        The mapping from index to class name is written into classes.json next to the shards. The samples are shuffled
+        reproducibly, so every shard contains a mix of all classes.
+
+        :param image_dataset_directory: The directory, that contains one sub-folder per class with the images
+        :param shard_directory: The directory, into which the shards will be written
+        :param class_names: The names of all classes, whose position in the list is their index. Must be the same for
+                            all splits of a dataset. Defaults to the sorted sub-folders of image_dataset_directory.
+        :param maximum_shard_size: The size in bytes after which a new shard is started
+        :param seed: An arbitrary seed that can be used to obtain a repeatable order of the samples
+        """
+        samples = [(image_class, image_name)
+                   for image_class in sorted(os.listdir(image_dataset_directory))
+                   if os.path.isdir(os.path.join(image_dataset_directory, image_class))
+                   for image_name in sorted(os.listdir(os.path.join(image_dataset_directory, image_class)))
+                   if image_name.endswith(".png")]
+        random.Random(seed).shuffle(samples)
+        if class_names is None:
+            class_names = sorted(set(image_class for image_class, _ in samples))
+        class_indices = {class_name: index for index, class_name in enumerate(class_names)}
+
+        os.makedirs(shard_directory, exist_ok=True)
+        with open(os.path.join(shard_directory, "classes.json"), "w") as file:
+            json.dump(class_names, file, indent=1)
+
+        shard_index = 0
+        shard = None
+        shard_size = 0
+        for image_class, image_name in tqdm(samples, desc="Writing shards into {0}".format(shard_directory)):
+            if shard is None or shard_size >= maximum_shard_size:
+                if shard is not None:
+                    shard.close()
+                # Hard-linked images (e.g. linked duplicates or split directories) must be stored with their content,
+                # because WebDataset skips all members that are not regular files
+                shard = tarfile.open(os.path.join(shard_directory, "shard-{0:06d}.tar".format(shard_index)), "w",
+                                     dereference=True)
+                shard_index += 1
+                shard_size = 0
+
+            key = "{0}/{1}".format(image_class, self.__escape_dots(os.path.splitext(image_name)[0]))
+            image_path = os.path.join(image_dataset_directory, image_class, image_name)
+            shard.add(image_path, arcname=key + ".png")
+            class_index = str(class_indices[image_class]).encode("utf-8")
+            self.__add_bytes(shard, key + ".cls", class_index)
+            class_name = image_class.encode("utf-8")
+            self.__add_bytes(shard, key + ".txt", class_name)
+            shard_size += os.path.getsize(image_path) + len(class_index) + len(class_name)
+
+        if shard is not None:
+            shard.close()
+
+    @staticmethod
+    def __escape_dots(name: str) -> str:
+        # WebDataset groups the files of a sample by the part of the name before the first dot, so dots are
+        # percent-encoded. Escaping the percent sign as well keeps different names from mapping to the same key.
+        return name.replace("%", "%25").replace(".", "%2E")
+
+    @staticmethod
+    def __add_bytes(shard: tarfile.TarFile, name: str, content: bytes):
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        shard.addfile(info, io.BytesIO(content))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--image_dataset_directory",
+        type=str,
+        default="../data/images/training",
+        help="The directory, where the images can be found, with one sub-folder per class")
+    parser.add_argument(
+        "--shard_directory",
+        type=str,
+        default="../data/shards/training",
+        help="The directory, where the shards will be written to")
+
+    flags, unparsed = parser.parse_known_args()
+
+    dataset_shard_writer = DatasetShardWriter()
+    dataset_shard_writer.write_shards(flags.image_dataset_directory, flags.shard_directory)
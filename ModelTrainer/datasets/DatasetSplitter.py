@@ -55,13 +55,14 @@ class DatasetSplitter:
         validation_sample_size = int(dataset_size * validation_percentage)
         test_sample_size = int(dataset_size * test_percentage)
         validation_sample_indices = random.sample(all_indices, validation_sample_size)
-        test_sample_indices = random.sample((set(all_indices) - set(validation_sample_indices)), test_sample_size)
+        test_sample_indices = random.sample(sorted(set(all_indices) - set(validation_sample_indices)),
+                                            test_sample_size)
         training_sample_indices = list(set(all_indices) - set(validation_sample_indices) - set(test_sample_indices))
         return training_sample_indices, validation_sample_indices, test_sample_indices
 
     def delete_split_directories(self):
         print("Deleting split directories... ")
-        shutil.rmtree(os.path.join(self.destination_directory, "train"), True)
+        shutil.rmtree(os.path.join(self.destination_directory, "training"), True)
         shutil.rmtree(os.path.join(self.destination_directory, "validation"), True)
         shutil.rmtree(os.path.join(self.destination_directory, "test"), True)
 
@@ -88,7 +89,17 @@ class DatasetSplitter:
         os.makedirs(destination_path, exist_ok=True)
         print("Copying {0} {2} files of {1}...".format(len(files), image_class, name_of_split))
         for image in files:
-            shutil.copy(os.path.join(path_to_images_of_class, image), destination_path)
+            self.__link_or_copy_file(os.path.join(path_to_images_of_class, image),
+                                     os.path.join(destination_path, image))
+
+    @staticmethod
+    def __link_or_copy_file(source_path: str, destination_path: str):
+        try:
+            # A hard link shares the data of the source file, so only the directory entry has to be written
+            os.link(source_path, destination_path)
+        except OSError:
+            # E.g. if the destination already exists or the file system does not support hard links
+            shutil.copy(source_path, destination_path)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -0,0 +1,75 @@
+import argparse
+import hashlib
+import os
+from collections import defaultdict
+
+from tqdm import tqdm
+
+
+class DuplicateImageLinker:
+    """ Class for replacing images with identical content by hard links to a single copy """
+
+    def link_duplicate_images(self, image_dataset_directory: str) -> int:
+        """
+        Replaces every *.png image that has exactly the same content as another image in the directory by a hard link
+        to that image. Only one physical copy is stored and subsequent steps that skip hard links to an already
+        processed file, e.g. the ImageResizer, process the content only once.
+
+        :param image_dataset_directory: The directory, that contains the images (in arbitrary sub-folders)
+        :return: The number of images that were replaced by a hard link
+        """
+        # Only images of the same file size can be identical, so most images never have to be hashed
+        images_by_file_size = defaultdict(list)
+        for directory, _, file_names in os.walk(image_dataset_directory):
+            for file_name in file_names:
+                if file_name.endswith(".png"):
+                    image_path = os.path.join(directory, file_name)
+                    images_by_file_size[os.path.getsize(image_path)].append(image_path)
+
+        number_of_linked_images = 0
+        candidates = [image_paths for image_paths in images_by_file_size.values() if len(image_paths) > 1]
+        for image_paths in tqdm(candidates, desc="Linking duplicate images"):
+            first_image_by_hash = dict()
+            for image_path in image_paths:
+                file_hash = self.__hash_file(image_path)
+                first_image = first_image_by_hash.setdefault(file_hash, image_path)
+                if first_image == image_path or os.path.samefile(first_image, image_path):
+                    continue
+                if self.__replace_by_hard_link(first_image, image_path):
+                    number_of_linked_images += 1
+
+        print("Replaced {0} duplicate images by hard links".format(number_of_linked_images))
+        return number_of_linked_images
+
+    @staticmethod
+    def __hash_file(file_path: str) -> bytes:
+        with open(file_path, "rb") as file:
+            return hashlib.blake2b(file.read()).digest()
+
+    @staticmethod
+    def __replace_by_hard_link(source_path: str, duplicate_path: str) -> bool:
+        temporary_link = duplicate_path + ".link"
+        try:
+            os.link(source_path, temporary_link)
+            # Replacing is atomic, so the duplicate is never missing, even if the process is interrupted
+            os.replace(temporary_link, duplicate_path)
+            return True
+        except OSError:
+            # E.g. if the file system does not support hard links, the duplicate is simply kept
+            if os.path.exists(temporary_link):
+                os.remove(temporary_link)
+            return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--image_dataset_directory",
+        type=str,
+        default="../data/images",
+        help="The directory, where the images can be found, in which duplicates should be linked")
+
+    flags, unparsed = parser.parse_known_args()
+
+    duplicate_image_linker = DuplicateImageLinker()
+    duplicate_image_linker.link_duplicate_images(flags.image_dataset_directory)
@@ -4,21 +4,35 @@ import json
 import os
 
 import shutil
+from typing import Tuple
+
+from PIL import Image
 
 from omrdatasettools.OmrDataset import OmrDataset
 from omrdatasettools.Downloader import Downloader
 from tqdm import tqdm
 
 import ImageColorInverter
+import ImageResizer
 
 
 class FornesMusicSymbolsImagePreparer(object):
     def __init__(self) -> None:
         self.path_of_this_file = os.path.dirname(os.path.realpath(__file__))
 
-    def prepare_dataset(self, raw_dataset_directory, image_dataset_directory):
+    def prepare_dataset(self, raw_dataset_directory, image_dataset_directory, target_size: Tuple[int, int] = None):
+        """
+        Inverts the raw images and copies them into the respective class folders of the image_dataset_directory.
+
+        :param target_size: Optional (width, height) to which the images are resized while copying them, so they
+                            don't have to be rewritten by a subsequent resizing step
+        """
         image_inverter = ImageColorInverter.ImageColorInverter()
-        image_inverter.invert_images(raw_dataset_directory, "*.bmp")
+        if target_size is None:
+            image_inverter.invert_images(raw_dataset_directory, "*.bmp")
+        else:
+            # The inverted images are only intermediates that are re-encoded while resizing them
+            image_inverter.invert_images(raw_dataset_directory, "*.bmp", compress_level=1)
 
         with open(os.path.join(self.path_of_this_file, "FornesMusicSymbolsBrokenSymbols.json")) as file:
             broken_symbols = json.load(file)
@@ -29,6 +43,7 @@ class FornesMusicSymbolsImagePreparer(object):
                              os.path.isdir(os.path.join(raw_dataset_directory, directory))]
 
         print("Copying images into respective class folders ...")
+        image_resizer = ImageResizer.ImageResizer()
 
         for symbol_class in tqdm(image_directories):
             destination_class_name = class_name_mapping[symbol_class]
@@ -37,7 +52,12 @@ class FornesMusicSymbolsImagePreparer(object):
             os.makedirs(destination_folder, exist_ok=True)
             all_png_images = [i for i in os.listdir(source_folder) if i.endswith(".png") and i not in broken_symbols]
             for image in all_png_images:
-                shutil.copy(os.path.join(source_folder, image), destination_folder)
+                if target_size is None:
+                    shutil.copy(os.path.join(source_folder, image), destination_folder)
+                else:
+                    image_resizer.resize_image_into(os.path.join(source_folder, image),
+                                                    os.path.join(destination_folder, image),
+                                                    target_size[0], target_size[1], Image.LANCZOS)
 
 
 if __name__ == "__main__":
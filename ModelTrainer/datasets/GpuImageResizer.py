@@ -0,0 +1,62 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import tensorflow as tf
+from PIL import Image
+from tqdm import tqdm
+
+import ImageResizer
+
+
+class GpuImageResizer:
+    """
+    Class for resizing images in batches with TensorFlow, which performs the Lanczos resampling on the GPU if one is
+    available. Loading and saving of the images is overlapped with a thread pool.
+    """
+
+    def resize_all_images(self, image_dataset_directory: str, width: int, height: int, batch_size: int = 256) -> None:
+        """
+        Resizes all *.png images in a directory in-situ to the specified width and height with a Lanczos filter.
+        Images that already have the desired size are left untouched.
+
+        :param image_dataset_directory: The directory, that contains the images (in arbitrary sub-folders)
+        :param width: The desired width of the images to be resized to
+        :param height: The desired height of the images to be resized to
+        :param batch_size: The number of images that are loaded and resized together
+        """
+        image_resizer = ImageResizer.ImageResizer()
+        # The sizes are read from the image headers, so images that already have the desired size are never decoded
+        all_images = [image_path for image_path in image_resizer.find_all_images(image_dataset_directory)
+                      if image_resizer.get_image_size(image_path) != (width, height)]
+
+        with ThreadPoolExecutor() as executor:
+            for first_image in tqdm(range(0, len(all_images), batch_size), desc="Resizing all images in batches"):
+                image_paths = all_images[first_image:first_image + batch_size]
+                images = executor.map(self.__load_image, image_paths)
+
+                # All images that are resized together must have the same size, so the batch is grouped by size
+                images_by_size = defaultdict(list)
+                for image_path, image in zip(image_paths, images):
+                    images_by_size[image.shape].append((image_path, image))
+
+                for paths_and_images in images_by_size.values():
+                    paths, images_of_same_size = zip(*paths_and_images)
+                    resized_images = tf.image.resize(numpy.stack(images_of_same_size), (height, width),
+                                                     method=tf.image.ResizeMethod.LANCZOS3, antialias=True)
+                    resized_images = tf.cast(tf.clip_by_value(tf.round(resized_images), 0, 255), tf.uint8).numpy()
+                    list(executor.map(self.__save_image, paths, resized_images))
+
+    @staticmethod
+    def __load_image(image_path: str) -> numpy.ndarray:
+        with Image.open(image_path) as image:
+            return numpy.asarray(image.convert('RGB'))
+
+    @staticmethod
+    def __save_image(image_path: str, image: numpy.ndarray):
+        Image.fromarray(image).save(image_path)
+
+
+if __name__ == "__main__":
+    image_resizer = GpuImageResizer()
+    image_resizer.resize_all_images("../data/images", 96, 96)
@@ -1,25 +1,34 @@
 import argparse
 import os
 from glob import glob
+from itertools import repeat
 
 from PIL import Image, ImageOps
-from tqdm import tqdm
+from tqdm.contrib.concurrent import thread_map
 
 
 class ImageColorInverter:
     """ Class for inverting white-on-black images to black-on-white images """
-    def invert_images(self, image_directory: str, image_file_ending: str = "*.bmp"):
+    def invert_images(self, image_directory: str, image_file_ending: str = "*.bmp", compress_level: int = 6):
         """
         In-situ converts the white on black images of a directory to black on white images
 
         :param image_directory: The directory, that contains the images
         :param image_file_ending: The pattern for finding files in the image_directory
+        :param compress_level: The zlib compression level (0-9) of the written png-images. Use a low level for
+                               intermediate images that are re-encoded afterwards anyway, since higher levels mostly
+                               cost time.
         """
         image_paths = [y for x in os.walk(image_directory) for y in glob(os.path.join(x[0], image_file_ending))]
-        for image_path in tqdm(image_paths, desc="Inverting all images in directory {0}".format(image_directory)):
-            white_on_black_image = Image.open(image_path).convert("L")
-            black_on_white_image = ImageOps.invert(white_on_black_image)
-            black_on_white_image.save(os.path.splitext(image_path)[0] + ".png")
+        # Pillow releases the GIL while decoding, inverting and encoding, so threads overlap the reading and writing
+        # of many small files with the work on others
+        thread_map(self.invert_image, image_paths, repeat(compress_level),
+                   desc="Inverting all images in directory {0}".format(image_directory))
+
+    def invert_image(self, image_path: str, compress_level: int = 6):
+        white_on_black_image = Image.open(image_path).convert("L")
+        black_on_white_image = ImageOps.invert(white_on_black_image)
+        black_on_white_image.save(os.path.splitext(image_path)[0] + ".png", compress_level=compress_level)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,17 @@
 import os
-from glob import glob
+import shutil
 from itertools import repeat
+from typing import List
 
+import imagesize
 from PIL import Image
 from tqdm.contrib.concurrent import process_map
 
 
 class ImageResizer:
+    # Below this number of images, spinning up worker processes costs more than it saves
+    minimum_number_of_images_for_parallel_resizing = 256
+
     def resize_all_images(self, image_dataset_directory: str, width: int, height: int, resampling_mode: int) -> None:
         """
         Resizes all *.png images in a directory in-situ to the specified width and height with the desired resampling
@@ -18,7 +23,13 @@ class ImageResizer:
         :param resampling_mode: The resampling method to be used.
             See :py:meth:`~PIL.Image.Image.resize` in :py:class:`PIL.Image.Image` for more details.
         """
-        all_images = [y for x in os.walk(image_dataset_directory) for y in glob(os.path.join(x[0], '*.png'))]
+        all_images = self.find_all_images(image_dataset_directory)
+
+        if len(all_images) < self.minimum_number_of_images_for_parallel_resizing:
+            for image_path in all_images:
+                self.resize_image(image_path, width, height, resampling_mode)
+            return
+
         process_map(
             self.resize_image,
             all_images,
@@ -26,15 +37,78 @@ class ImageResizer:
             repeat(height),
             repeat(resampling_mode),
             max_workers=os.cpu_count(),
+            chunksize=32,
             desc="Resizing all images"
         )
 
+    def find_all_images(self, image_dataset_directory: str) -> List[str]:
+        """
+        Returns the paths of all *.png images in the directory and its sub-folders. Of multiple hard links to the same
+        file (e.g. created when splitting the dataset) only the first one is returned, so the file is resized once
+        instead of being read and rewritten by two workers at the same time.
+        """
+        all_images = []
+        seen_files = set()
+        for directory, _, file_names in os.walk(image_dataset_directory):
+            for file_name in file_names:
+                if not file_name.endswith(".png"):
+                    continue
+                image_path = os.path.join(directory, file_name)
+                file_status = os.stat(image_path)
+                if file_status.st_nlink > 1:
+                    file_id = (file_status.st_dev, file_status.st_ino)
+                    if file_id in seen_files:
+                        continue
+                    seen_files.add(file_id)
+                all_images.append(image_path)
+        return all_images
+
     def resize_image(self, image_path: str, width: int, height: int, resampling_mode: int):
-        img = Image.open(image_path).convert('RGB')
-        hw_tuple = (height, width)
-        if img.size != hw_tuple:
-            img = img.resize(hw_tuple, resampling_mode)
-            img.save(image_path)
+        if self.get_image_size(image_path) != (width, height):
+            img = Image.open(image_path)
+            self.__resize(img, width, height, resampling_mode).save(image_path)
+
+    def resize_image_into(self, image_path: str, destination_path: str, width: int, height: int,
+                          resampling_mode: int) -> None:
+        """
+        Resizes a single image like :py:meth:`resize_image`, but writes the result to destination_path instead of
+        overwriting the source. Used by the dataset preparers to resize while copying, so every image is written
+        only once at its final size.
+        """
+        with Image.open(image_path) as img:
+            if img.size == (width, height):
+                # Re-encoded instead of copied, because the source may be an intermediate file with a low compression
+                img.save(destination_path)
+            else:
+                self.__resize(img, width, height, resampling_mode).save(destination_path)
+
+    def resize_all_images_into(self, source_directory: str, destination_directory: str, width: int, height: int,
+                               resampling_mode: int) -> None:
+        """
+        Copies all files of the source_directory into the destination_directory and resizes the *.png images on the
+        way. Other files are copied unchanged.
+        """
+        os.makedirs(destination_directory, exist_ok=True)
+        for file_name in os.listdir(source_directory):
+            source_path = os.path.join(source_directory, file_name)
+            if not os.path.isfile(source_path):
+                continue
+            destination_path = os.path.join(destination_directory, file_name)
+            if file_name.endswith(".png"):
+                self.resize_image_into(source_path, destination_path, width, height, resampling_mode)
+            else:
+                shutil.copy(source_path, destination_path)
+
+    def get_image_size(self, image_path: str) -> (int, int):
+        # Only parses the image header instead of setting up a full decoder
+        return imagesize.get(image_path)
+
+    def __resize(self, img: Image.Image, width: int, height: int, resampling_mode: int) -> Image.Image:
+        if img.mode not in ("L", "RGB"):
+            img = img.convert('RGB')
+        # Resampling a grayscale image before expanding it to RGB convolves a third of the data.
+        img = img.resize((width, height), resampling_mode)
+        return img.convert('RGB')
 
 
 if __name__ == "__main__":
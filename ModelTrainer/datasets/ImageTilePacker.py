@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+from typing import List
+
+import numpy
+from PIL import Image
+from tqdm import tqdm
+
+
+class ImageTilePacker:
+    """ Class for packing the images of each class into tiles, so many symbols can be loaded with a single decode """
+
+    def pack_images_into_tiles(self, image_dataset_directory: str, tile_dataset_directory: str, width: int,
+                               height: int, tile_rows: int = 8, tile_columns: int = 8) -> None:
+        """
+        Packs up to tile_rows x tile_columns images of the same class into one tile image. For every tile, a png-image
+        and a json-index with the same name are created in tile_dataset_directory/<class>/, e.g. tile-00000.png and
+        tile-00000.json. The index lists the original file name and the position (x, y, width, height) of each image
+        inside of the tile. Unused positions of the last tile of a class remain white.
+
+        :param image_dataset_directory: The directory, that contains one sub-folder per class with the images
+        :param tile_dataset_directory: The directory, into which the tiles will be written
+        :param width: The width of a single image inside of the tile. Images of different size will be resized.
+        :param height: The height of a single image inside of the tile. Images of different size will be resized.
+        :param tile_rows: The number of images per tile in vertical direction
+        :param tile_columns: The number of images per tile in horizontal direction
+        """
+        images_per_tile = tile_rows * tile_columns
+        image_classes = [image_class for image_class in sorted(os.listdir(image_dataset_directory))
+                         if os.path.isdir(os.path.join(image_dataset_directory, image_class))]
+
+        for image_class in tqdm(image_classes, desc="Packing images into tiles"):
+            class_directory = os.path.join(image_dataset_directory, image_class)
+            image_names = sorted(i for i in os.listdir(class_directory) if i.endswith(".png"))
+            if not image_names:
+                # E.g. the training, validation and test directories after splitting the dataset
+                continue
+
+            destination_directory = os.path.join(tile_dataset_directory, image_class)
+            os.makedirs(destination_directory, exist_ok=True)
+            for tile_index, first_image in enumerate(range(0, len(image_names), images_per_tile)):
+                self.__write_tile(class_directory, image_names[first_image:first_image + images_per_tile],
+                                  os.path.join(destination_directory, "tile-{0:05d}".format(tile_index)),
+                                  width, height, tile_rows, tile_columns)
+
+    def __write_tile(self, class_directory: str, image_names: List[str], tile_path_without_extension: str,
+                     width: int, height: int, tile_rows: int, tile_columns: int):
+        images = numpy.full((tile_rows * tile_columns, height, width, 3), 255, dtype=numpy.uint8)
+        for index, image_name in enumerate(image_names):
+            with Image.open(os.path.join(class_directory, image_name)) as image:
+                image = image.convert("RGB")
+                if image.size != (width, height):
+                    image = image.resize((width, height), Image.LANCZOS)
+                images[index] = numpy.asarray(image)
+
+        # (rows * columns, height, width, 3) -> (rows * height, columns * width, 3), filling the tile row by row
+        tile = images.reshape(tile_rows, tile_columns, height, width, 3) \
+            .transpose(0, 2, 1, 3, 4) \
+            .reshape(tile_rows * height, tile_columns * width, 3)
+        Image.fromarray(tile).save(tile_path_without_extension + ".png")
+
+        tile_index = [{"file_name": image_name,
+                       "x": (index % tile_columns) * width,
+                       "y": (index // tile_columns) * height,
+                       "width": width,
+                       "height": height} for index, image_name in enumerate(image_names)]
+        with open(tile_path_without_extension + ".json", "w") as file:
+            json.dump(tile_index, file, indent=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--image_dataset_directory",
+        type=str,
+        default="../data/images",
+        help="The directory, where the images can be found, with one sub-folder per class")
+    parser.add_argument(
+        "--tile_dataset_directory",
+        type=str,
+        default="../data/tiles",
+        help="The directory, where the tiles will be written to")
+    parser.add_argument("--width", default=96, type=int, help="Width of a single image inside of a tile in pixel")
+    parser.add_argument("--height", default=96, type=int, help="Height of a single image inside of a tile in pixel")
+
+    flags, unparsed = parser.parse_known_args()
+
+    image_tile_packer = ImageTilePacker()
+    image_tile_packer.pack_images_into_tiles(flags.image_dataset_directory, flags.tile_dataset_directory, flags.width,
+                                             flags.height)
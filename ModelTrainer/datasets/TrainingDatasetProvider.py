@@ -1,8 +1,13 @@
 import argparse
+import glob
+import hashlib
 import os
 import pickle
 import shutil
-from typing import List
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 from PIL import Image
 from omrdatasettools.Downloader import Downloader
@@ -11,9 +16,12 @@ from omrdatasettools.HomusImageGenerator import HomusImageGenerator
 from omrdatasettools.OmrDataset import OmrDataset
 
 import AudiverisOmrImageExtractor
+import DatasetShardWriter
 import DatasetSplitter
+import DuplicateImageLinker
 import FornesMusicSymbolsImagePreparer
 import ImageResizer
+import ImageTilePacker
 import MuscimaPlusPlusImageGenerator2
 import OpenOmrImagePreparer
 
@@ -24,94 +32,279 @@ class TrainingDatasetProvider:
     It deletes the existing directory, handles the downloading, creating, resizing and splitting of the
     requested datasets for a subsequent training.
     """
+    __slots__ = ("dataset_directory", "image_dataset_directory", "tile_dataset_directory", "shard_dataset_directory",
+                 "cache_directory")
 
     def __init__(self, dataset_directory: str) -> None:
         self.dataset_directory = dataset_directory
         self.image_dataset_directory = os.path.join(dataset_directory, "images")
+        self.tile_dataset_directory = os.path.join(dataset_directory, "tiles")
+        self.shard_dataset_directory = os.path.join(dataset_directory, "shards")
+        # Lives next to the dataset_directory, because the dataset_directory is deleted on every run
+        self.cache_directory = os.path.normpath(dataset_directory) + "_cache"
 
     def recreate_and_prepare_datasets_for_training(self, datasets: List[str], width: int, height: int,
                                                    use_fixed_canvas: bool,
                                                    stroke_thicknesses_for_generated_symbols: List[int],
                                                    staff_line_spacing: int,
                                                    staff_line_vertical_offsets: List[int],
-                                                   random_position_on_canvas: bool) -> None:
+                                                   random_position_on_canvas: bool,
+                                                   use_cache: bool = False,
+                                                   pack_tiles: bool = False,
+                                                   resize_to_fixed_size: bool = False) -> None:
         """
         Deletes the dataset_directory and recreates the requested datasets into that folder.
         Some datasets just need to be downloaded and extracted (e.g. PrintedMusicSymbolsDataset),
         whereas other datasets require more extensive generation operations, e.g. Homus dataset.
+
+        :param use_cache: If True, the prepared images and bounding boxes are stored in the cache_directory per
+                          combination of parameters and restored from there on subsequent runs with the same
+                          parameters instead of being recreated.
+        :param pack_tiles: If True, the images of each class are additionally packed into tiles of 8x8 images of
+                           width x height into the tile_dataset_directory, see ImageTilePacker.
+        :param resize_to_fixed_size: If True, the datasets that are prepared by this repository (Fornes, Audiveris and
+                                     OpenOMR) are already resized to width x height while being copied, so a
+                                     subsequent resize_all_images_to_fixed_size skips them. Only set this if that
+                                     resize step follows, otherwise these datasets have a different size than the rest.
         """
+        cached_dataset_directory = None
+        if use_cache:
+            cache_key = self.__get_cache_key(datasets, width, height, use_fixed_canvas,
+                                             stroke_thicknesses_for_generated_symbols, staff_line_spacing,
+                                             staff_line_vertical_offsets, random_position_on_canvas,
+                                             resize_to_fixed_size)
+            cached_dataset_directory = os.path.join(self.cache_directory, cache_key)
+
         self.__delete_dataset_directory()
-        self.__download_and_extract_datasets(datasets, width, height, use_fixed_canvas, staff_line_spacing,
-                                             staff_line_vertical_offsets, stroke_thicknesses_for_generated_symbols,
-                                             random_position_on_canvas)
 
-    def resize_all_images_to_fixed_size(self, width, height):
+        if cached_dataset_directory is not None and os.path.exists(os.path.join(cached_dataset_directory, ".done")):
+            self.__restore_datasets_from_cache(cached_dataset_directory)
+        else:
+            self.__download_and_extract_datasets(datasets, width, height, use_fixed_canvas, staff_line_spacing,
+                                                 staff_line_vertical_offsets, stroke_thicknesses_for_generated_symbols,
+                                                 random_position_on_canvas, resize_to_fixed_size)
+            if cached_dataset_directory is not None:
+                self.__store_datasets_in_cache(cached_dataset_directory)
+
+        if pack_tiles:
+            image_tile_packer = ImageTilePacker.ImageTilePacker()
+            image_tile_packer.pack_images_into_tiles(self.image_dataset_directory, self.tile_dataset_directory,
+                                                     width, height)
+
+    def resize_all_images_to_fixed_size(self, width, height, use_gpu: bool = False):
         print("Resizing all images with the LANCZOS interpolation to {0}x{1}px (width x height).".format(width, height))
-        image_resizer = ImageResizer()
+        if use_gpu:
+            # Imported here, so TensorFlow is only loaded when it is actually needed
+            import GpuImageResizer
+            gpu_image_resizer = GpuImageResizer.GpuImageResizer()
+            gpu_image_resizer.resize_all_images(self.image_dataset_directory, width, height)
+            return
+
+        image_resizer = ImageResizer.ImageResizer()
         image_resizer.resize_all_images(self.image_dataset_directory, width, height, Image.LANCZOS)
 
     def split_dataset_into_training_validation_and_test_set(self):
-        dataset_splitter = DatasetSplitter(self.image_dataset_directory, self.image_dataset_directory)
+        dataset_splitter = DatasetSplitter.DatasetSplitter(self.image_dataset_directory,
+                                                           self.image_dataset_directory)
         dataset_splitter.delete_split_directories()
         dataset_splitter.split_images_into_training_validation_and_test_set()
 
+    def write_dataset_shards(self):
+        """
+        Packs the training, validation and test sets into tar-shards in the WebDataset format inside the
+        shard_dataset_directory, so they can be read sequentially during the training. Requires the dataset to be
+        split before, see split_dataset_into_training_validation_and_test_set.
+        """
+        shutil.rmtree(self.shard_dataset_directory, True)
+        split_directories = [os.path.join(self.image_dataset_directory, name_of_split)
+                             for name_of_split in ["training", "validation", "test"]]
+        split_directories = [split_directory for split_directory in split_directories
+                             if os.path.isdir(split_directory)]
+        # All splits must share the same class indices, even if a class is missing in one of them
+        class_names = sorted(set(image_class for split_directory in split_directories
+                                 for image_class in os.listdir(split_directory)
+                                 if os.path.isdir(os.path.join(split_directory, image_class))))
+
+        dataset_shard_writer = DatasetShardWriter.DatasetShardWriter()
+        for split_directory in split_directories:
+            dataset_shard_writer.write_shards(split_directory,
+                                              os.path.join(self.shard_dataset_directory,
+                                                           os.path.basename(split_directory)),
+                                              class_names)
+
     def __delete_dataset_directory(self):
         print("Deleting dataset directory {0}".format(self.dataset_directory))
+        # Directories of previous runs that were interrupted before their deletion finished are deleted as well
+        directories_to_delete = glob.glob(glob.escape(os.path.normpath(self.dataset_directory)) + ".old-*")
+
         if os.path.exists(self.dataset_directory):
-            shutil.rmtree(self.dataset_directory)
+            # Renaming is a cheap metadata operation, so the directory can be recreated immediately while the old
+            # files are deleted in the background.
+            directory_to_delete = "{0}.old-{1}".format(os.path.normpath(self.dataset_directory), uuid.uuid4().hex)
+            try:
+                os.rename(self.dataset_directory, directory_to_delete)
+                directories_to_delete.append(directory_to_delete)
+            except OSError:
+                # E.g. on Windows, if a file inside the directory is still opened by another process
+                shutil.rmtree(self.dataset_directory)
+
+        if directories_to_delete:
+            # The thread is not a daemon, so the program waits for it to finish
+            threading.Thread(target=self.__delete_directories, args=(directories_to_delete,), daemon=False).start()
+
+    @staticmethod
+    def __delete_directories(directories: List[str]):
+        for directory in directories:
+            try:
+                shutil.rmtree(directory)
+            except OSError as error:
+                # The directory is picked up again by the next run
+                print("Could not delete {0}: {1}".format(directory, error))
+
+    @staticmethod
+    def __get_cache_key(datasets, width, height, use_fixed_canvas, stroke_thicknesses_for_generated_symbols,
+                        staff_line_spacing, staff_line_vertical_offsets, random_position_on_canvas,
+                        resize_to_fixed_size) -> str:
+        parameters = (sorted(datasets), width, height, use_fixed_canvas, list(stroke_thicknesses_for_generated_symbols),
+                      staff_line_spacing, list(staff_line_vertical_offsets), random_position_on_canvas,
+                      resize_to_fixed_size)
+        return hashlib.blake2b(repr(parameters).encode("utf-8"), digest_size=16).hexdigest()
+
+    def __restore_datasets_from_cache(self, cached_dataset_directory: str):
+        print("Restoring datasets from cache {0}".format(cached_dataset_directory))
+        # The images are copied instead of linked, because later steps resize them in-situ
+        shutil.copytree(os.path.join(cached_dataset_directory, "images"), self.image_dataset_directory)
+        cached_bounding_boxes = os.path.join(cached_dataset_directory, "bounding_boxes.txt")
+        if os.path.exists(cached_bounding_boxes):
+            shutil.copy(cached_bounding_boxes, self.dataset_directory)
+
+    def __store_datasets_in_cache(self, cached_dataset_directory: str):
+        if not os.path.isdir(self.image_dataset_directory):
+            # E.g. if none of the requested datasets is known, there is nothing worth caching
+            print("No images were created, skipping the cache")
+            return
+        print("Storing datasets in cache {0}".format(cached_dataset_directory))
+        shutil.rmtree(cached_dataset_directory, ignore_errors=True)
+        shutil.copytree(self.image_dataset_directory, os.path.join(cached_dataset_directory, "images"))
+        bounding_boxes = os.path.join(self.dataset_directory, "bounding_boxes.txt")
+        if os.path.exists(bounding_boxes):
+            shutil.copy(bounding_boxes, cached_dataset_directory)
+        # Marks the cache entry as complete, so an interrupted run is not mistaken for a valid cache entry
+        open(os.path.join(cached_dataset_directory, ".done"), "w").close()
 
     def __download_and_extract_datasets(self, datasets, width, height, use_fixed_canvas, staff_line_spacing,
                                         staff_line_vertical_offsets, stroke_thicknesses_for_generated_symbols,
-                                        random_position_on_canvas: bool):
-        dataset_downloader = Downloader()
+                                        random_position_on_canvas: bool, resize_to_fixed_size: bool):
+        target_size = (width, height) if resize_to_fixed_size else None
+        # The datasets are prepared into disjoint raw directories and only meet in the image_dataset_directory,
+        # so downloading and preparing them concurrently overlaps the network transfers with the extraction work.
+        preparation_tasks = []
         if 'homus' in datasets:
-            raw_dataset_directory = os.path.join(self.dataset_directory, "homus_raw")
-            dataset_downloader.download_and_extract_dataset(OmrDataset.Homus_V2, raw_dataset_directory)
-            generated_image_width = width
-            generated_image_height = height
-            if not use_fixed_canvas:
-                # If we are not using a fixed canvas, remove those arguments to
-                # allow symbols being drawn at their original shapes
-                generated_image_width, generated_image_height = None, None
-            bounding_boxes = HomusImageGenerator.create_images(raw_dataset_directory, self.image_dataset_directory,
-                                                               stroke_thicknesses_for_generated_symbols,
-                                                               generated_image_width,
-                                                               generated_image_height, staff_line_spacing,
-                                                               staff_line_vertical_offsets,
-                                                               random_position_on_canvas)
-
-            bounding_boxes_cache = os.path.join(self.dataset_directory, "bounding_boxes.txt")
-            with open(bounding_boxes_cache, "wb") as cache:
-                pickle.dump(bounding_boxes, cache)
-        if 'rebelo1' in datasets:
-            dataset_downloader.download_and_extract_dataset(OmrDataset.Rebelo1, self.image_dataset_directory)
-        if 'rebelo2' in datasets:
-            dataset_downloader.download_and_extract_dataset(OmrDataset.Rebelo2, self.image_dataset_directory)
-        if 'printed' in datasets:
-            dataset_downloader.download_and_extract_dataset(OmrDataset.Printed, self.image_dataset_directory)
+            preparation_tasks.append(lambda: self.__prepare_homus(width, height, use_fixed_canvas, staff_line_spacing,
+                                                                  staff_line_vertical_offsets,
+                                                                  stroke_thicknesses_for_generated_symbols,
+                                                                  random_position_on_canvas))
+        # Rebelo and Printed need no preparation, but zip-extraction does not tolerate class folders that are created
+        # concurrently by the other tasks, so they are extracted into their own raw directory and moved from there.
+        # They are processed one after another to keep the order in which files with the same name overwrite each other.
+        directly_extracted_datasets = [(name, dataset) for name, dataset in [('rebelo1', OmrDataset.Rebelo1),
+                                                                             ('rebelo2', OmrDataset.Rebelo2),
+                                                                             ('printed', OmrDataset.Printed)]
+                                       if name in datasets]
+        if directly_extracted_datasets:
+            preparation_tasks.append(lambda: self.__extract_datasets_into_image_directory(directly_extracted_datasets))
         if 'fornes' in datasets:
-            raw_dataset_directory = os.path.join(self.dataset_directory, "fornes_raw")
-            dataset_downloader.download_and_extract_dataset(OmrDataset.Fornes, raw_dataset_directory)
-            image_preparer = FornesMusicSymbolsImagePreparer.FornesMusicSymbolsImagePreparer()
-            image_preparer.prepare_dataset(raw_dataset_directory, self.image_dataset_directory)
+            preparation_tasks.append(lambda: self.__prepare_fornes(target_size))
         if 'audiveris' in datasets:
-            raw_dataset_directory = os.path.join(self.dataset_directory, "audiveris_omr_raw")
-            intermediate_image_directory = os.path.join(self.dataset_directory, "audiveris_omr_images")
-            dataset_downloader.download_and_extract_dataset(OmrDataset.Audiveris, raw_dataset_directory)
-            image_generator = AudiverisOmrImageExtractor.AudiverisOmrImageGenerator()
-            image_generator.extract_symbols(raw_dataset_directory, intermediate_image_directory)
-            image_preparer = AudiverisOmrImageExtractor.AudiverisOmrImageExtractor()
-            image_preparer.prepare_dataset(intermediate_image_directory, self.image_dataset_directory)
+            preparation_tasks.append(lambda: self.__prepare_audiveris(target_size))
         if 'muscima_pp' in datasets:
-            raw_dataset_directory = os.path.join(self.dataset_directory, "muscima_pp_raw")
-            dataset_downloader.download_and_extract_dataset(OmrDataset.MuscimaPlusPlus_V2, raw_dataset_directory)
-            image_generator = MuscimaPlusPlusImageGenerator2.MuscimaPlusPlusImageGenerator2()
-            image_generator.extract_symbols_for_training(raw_dataset_directory, self.image_dataset_directory)
+            preparation_tasks.append(self.__prepare_muscima_pp)
         if 'openomr' in datasets:
-            raw_dataset_directory = os.path.join(self.dataset_directory, "open_omr_raw")
-            dataset_downloader.download_and_extract_dataset(OmrDataset.OpenOmr, raw_dataset_directory)
-            image_preparer = OpenOmrImagePreparer.OpenOmrImagePreparer()
-            image_preparer.prepare_dataset(raw_dataset_directory, self.image_dataset_directory)
+            preparation_tasks.append(lambda: self.__prepare_open_omr(target_size))
+
+        if not preparation_tasks:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(preparation_tasks)) as executor:
+            futures = [executor.submit(task) for task in preparation_tasks]
+            for future in futures:
+                # Re-raises the first exception that occurred while preparing a dataset
+                future.result()
+
+    def __prepare_homus(self, width, height, use_fixed_canvas, staff_line_spacing, staff_line_vertical_offsets,
+                        stroke_thicknesses_for_generated_symbols, random_position_on_canvas: bool):
+        raw_dataset_directory = os.path.join(self.dataset_directory, "homus_raw")
+        generated_image_directory = os.path.join(self.dataset_directory, "homus_images")
+        Downloader().download_and_extract_dataset(OmrDataset.Homus_V2, raw_dataset_directory)
+        generated_image_width = width
+        generated_image_height = height
+        if not use_fixed_canvas:
+            # If we are not using a fixed canvas, remove those arguments to
+            # allow symbols being drawn at their original shapes
+            generated_image_width, generated_image_height = None, None
+        bounding_boxes = HomusImageGenerator.create_images(raw_dataset_directory, generated_image_directory,
+                                                           stroke_thicknesses_for_generated_symbols,
+                                                           generated_image_width,
+                                                           generated_image_height, staff_line_spacing,
+                                                           staff_line_vertical_offsets,
+                                                           random_position_on_canvas)
+
+        bounding_boxes_cache = os.path.join(self.dataset_directory, "bounding_boxes.txt")
+        with open(bounding_boxes_cache, "wb") as cache:
+            pickle.dump(bounding_boxes, cache, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Different stroke thicknesses and staff-line offsets may produce identical images. The images are generated
+        # into a private directory, so only they are hashed, and moving them keeps the hard links intact.
+        # Note that restoring the datasets from the cache copies the images and therefore does not preserve the links.
+        duplicate_image_linker = DuplicateImageLinker.DuplicateImageLinker()
+        duplicate_image_linker.link_duplicate_images(generated_image_directory)
+        self.__move_into_image_dataset_directory(generated_image_directory)
+
+    def __extract_datasets_into_image_directory(self, datasets: List[Tuple[str, OmrDataset]]):
+        dataset_downloader = Downloader()
+        for name, dataset in datasets:
+            raw_dataset_directory = os.path.join(self.dataset_directory, name + "_raw")
+            dataset_downloader.download_and_extract_dataset(dataset, raw_dataset_directory)
+            self.__move_into_image_dataset_directory(raw_dataset_directory)
+
+    def __move_into_image_dataset_directory(self, source_directory: str):
+        """
+        Moves all files from the source_directory into the same relative location inside the image_dataset_directory.
+        Unlike extracting or copying a tree, this tolerates folders that are created concurrently by other tasks.
+        """
+        for directory, _, file_names in os.walk(source_directory):
+            destination_directory = os.path.join(self.image_dataset_directory,
+                                                 os.path.relpath(directory, source_directory))
+            os.makedirs(destination_directory, exist_ok=True)
+            for file_name in file_names:
+                os.replace(os.path.join(directory, file_name), os.path.join(destination_directory, file_name))
+
+    def __prepare_fornes(self, target_size: Optional[Tuple[int, int]]):
+        raw_dataset_directory = os.path.join(self.dataset_directory, "fornes_raw")
+        Downloader().download_and_extract_dataset(OmrDataset.Fornes, raw_dataset_directory)
+        image_preparer = FornesMusicSymbolsImagePreparer.FornesMusicSymbolsImagePreparer()
+        image_preparer.prepare_dataset(raw_dataset_directory, self.image_dataset_directory, target_size)
+
+    def __prepare_audiveris(self, target_size: Optional[Tuple[int, int]]):
+        raw_dataset_directory = os.path.join(self.dataset_directory, "audiveris_omr_raw")
+        intermediate_image_directory = os.path.join(self.dataset_directory, "audiveris_omr_images")
+        Downloader().download_and_extract_dataset(OmrDataset.Audiveris, raw_dataset_directory)
+        image_generator = AudiverisOmrImageExtractor.AudiverisOmrImageGenerator()
+        image_generator.extract_symbols(raw_dataset_directory, intermediate_image_directory)
+        image_preparer = AudiverisOmrImageExtractor.AudiverisOmrImageExtractor()
+        image_preparer.prepare_dataset(intermediate_image_directory, self.image_dataset_directory, target_size)
+
+    def __prepare_muscima_pp(self):
+        raw_dataset_directory = os.path.join(self.dataset_directory, "muscima_pp_raw")
+        Downloader().download_and_extract_dataset(OmrDataset.MuscimaPlusPlus_V2, raw_dataset_directory)
+        image_generator = MuscimaPlusPlusImageGenerator2.MuscimaPlusPlusImageGenerator2()
+        image_generator.extract_symbols_for_training(raw_dataset_directory, self.image_dataset_directory)
+
+    def __prepare_open_omr(self, target_size: Optional[Tuple[int, int]]):
+        raw_dataset_directory = os.path.join(self.dataset_directory, "open_omr_raw")
+        Downloader().download_and_extract_dataset(OmrDataset.OpenOmr, raw_dataset_directory)
+        image_preparer = OpenOmrImagePreparer.OpenOmrImagePreparer()
+        image_preparer.prepare_dataset(raw_dataset_directory, self.image_dataset_directory, target_size)
 
     @staticmethod
     def add_arguments_for_training_dataset_provider(parser: argparse.ArgumentParser):
@@ -123,20 +316,37 @@ class TrainingDatasetProvider:
                                  "following are possible: homus, rebelo1, rebelo2, printed, audiveris, muscima_pp, "
                                  "fornes or openomr. "
                                  "Multiple values are connected by a separating comma, i.e. 'homus,rebelo1'")
+        parser.add_argument("--use_dataset_cache", dest="use_dataset_cache", action="store_true", default=False,
+                            help="Stores the prepared datasets next to the dataset directory and restores them from "
+                                 "there on subsequent runs with the same parameters instead of recreating them")
+        parser.add_argument("--gpu_resize", dest="gpu_resize", action="store_true", default=False,
+                            help="When resizing the images, resizes them in batches with TensorFlow, which uses the GPU "
+                                 "if available, instead of with Pillow on all CPU cores")
+        parser.add_argument("--pack_tiles", dest="pack_tiles", action="store_true", default=False,
+                            help="Additionally packs the images of each class into tiles of 8x8 images, so they can be "
+                                 "loaded with a single file access")
         HomusImageGenerator.add_arguments_for_homus_image_generator(parser)
 
 
+def parse_comma_separated_integers(value: str) -> List[int]:
+    """ Parses a string like '1,2,3' into [1, 2, 3]. Empty elements, e.g. from '' or '1,,2,', are skipped. """
+    return [int(element) for element in value.split(',') if element.strip() != ""]
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--dataset_directory", type=str, default="../data",
                         help="The directory, where the dataset should be created in")
+    parser.add_argument("--resize_images", dest="resize_images", action="store_true", default=False,
+                        help="Resizes all images to width x height after the datasets have been prepared")
+    parser.add_argument("--write_shards", dest="write_shards", action="store_true", default=False,
+                        help="Splits the images into training, validation and test set and packs each of them into "
+                             "tar-shards in the WebDataset format")
     TrainingDatasetProvider.add_arguments_for_training_dataset_provider(parser)
     flags, unparsed = parser.parse_known_args()
 
-    offsets = []
-    if flags.offsets != "":
-        offsets = [int(o) for o in flags.offsets.split(',')]
-    stroke_thicknesses_for_generated_symbols = [int(s) for s in flags.stroke_thicknesses.split(',')]
+    offsets = parse_comma_separated_integers(flags.offsets)
+    stroke_thicknesses_for_generated_symbols = parse_comma_separated_integers(flags.stroke_thicknesses)
 
     if flags.datasets == "":
         raise Exception("No dataset selected. Specify the dataset for the training via the --dataset parameter")
@@ -150,5 +360,16 @@ if __name__ == "__main__":
         stroke_thicknesses_for_generated_symbols=stroke_thicknesses_for_generated_symbols,
         staff_line_spacing=flags.staff_line_spacing,
         staff_line_vertical_offsets=offsets,
-        random_position_on_canvas=False)
+        random_position_on_canvas=False,
+        use_cache=flags.use_dataset_cache,
+        pack_tiles=flags.pack_tiles,
+        resize_to_fixed_size=flags.resize_images)
+
+    if flags.resize_images:
+        training_dataset_provider.resize_all_images_to_fixed_size(flags.width, flags.height,
+                                                                  use_gpu=flags.gpu_resize)
+
+    if flags.write_shards:
+        training_dataset_provider.split_dataset_into_training_validation_and_test_set()
+        training_dataset_provider.write_dataset_shards()
 
@@ -0,0 +1,100 @@
+import json
+import os
+import tarfile
+
+from PIL import Image
+
+from DatasetShardWriter import DatasetShardWriter
+
+
+class DatasetShardWriterTest:
+    def test_write_shards_expect_image_class_index_and_class_name_per_sample(self, tmp_path):
+        # Arrange
+        for class_name, image_names in [("Flat", ["0.png", "1.png"]), ("Sharp", ["a.b.png"])]:
+            os.makedirs(tmp_path / "images" / class_name)
+            for image_name in image_names:
+                Image.new("L", (10, 10), 0).save(tmp_path / "images" / class_name / image_name)
+        shard_directory = tmp_path / "shards"
+
+        # Act
+        DatasetShardWriter().write_shards(str(tmp_path / "images"), str(shard_directory))
+
+        # Assert
+        assert sorted(os.listdir(shard_directory)) == ["classes.json", "shard-000000.tar"]
+        with open(shard_directory / "classes.json") as file:
+            assert json.load(file) == ["Flat", "Sharp"]
+        with tarfile.open(shard_directory / "shard-000000.tar") as shard:
+            members = shard.getnames()
+            assert sorted(members) == ["Flat/0.cls", "Flat/0.png", "Flat/0.txt", "Flat/1.cls", "Flat/1.png",
+                                       "Flat/1.txt", "Sharp/a%2Eb.cls", "Sharp/a%2Eb.png", "Sharp/a%2Eb.txt"]
+            # WebDataset expects the files of a sample to be stored consecutively
+            keys = [member.rsplit(".", 1)[0] for member in members]
+            for first_file in range(0, len(keys), 3):
+                assert keys[first_file] == keys[first_file + 1] == keys[first_file + 2]
+            assert int(shard.extractfile("Sharp/a%2Eb.cls").read()) == 1
+            assert shard.extractfile("Sharp/a%2Eb.txt").read().decode("utf-8") == "Sharp"
+
+    def test_write_shards_with_class_names_expect_given_class_indices(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "images" / "Sharp")
+        Image.new("L", (10, 10), 0).save(tmp_path / "images" / "Sharp" / "0.png")
+        shard_directory = tmp_path / "shards"
+
+        # Act
+        DatasetShardWriter().write_shards(str(tmp_path / "images"), str(shard_directory), ["Flat", "Natural", "Sharp"])
+
+        # Assert
+        with tarfile.open(shard_directory / "shard-000000.tar") as shard:
+            assert int(shard.extractfile("Sharp/0.cls").read()) == 2
+        with open(shard_directory / "classes.json") as file:
+            assert json.load(file) == ["Flat", "Natural", "Sharp"]
+
+    def test_write_shards_with_small_maximum_shard_size_expect_one_sample_per_shard(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "images" / "Flat")
+        for index in range(3):
+            Image.new("L", (10, 10), 0).save(tmp_path / "images" / "Flat" / "{0}.png".format(index))
+        shard_directory = tmp_path / "shards"
+
+        # Act
+        DatasetShardWriter().write_shards(str(tmp_path / "images"), str(shard_directory), maximum_shard_size=1)
+
+        # Assert
+        shards = sorted(name for name in os.listdir(shard_directory) if name.endswith(".tar"))
+        assert shards == ["shard-000000.tar", "shard-000001.tar", "shard-000002.tar"]
+        for shard_name in shards:
+            with tarfile.open(shard_directory / shard_name) as shard:
+                assert len(shard.getnames()) == 3
+
+    def test_write_shards_with_hard_linked_images_expect_every_image_to_be_stored_with_its_content(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "images" / "Flat")
+        Image.new("L", (10, 10), 0).save(tmp_path / "images" / "Flat" / "0.png")
+        os.link(tmp_path / "images" / "Flat" / "0.png", tmp_path / "images" / "Flat" / "1.png")
+        shard_directory = tmp_path / "shards"
+
+        # Act
+        DatasetShardWriter().write_shards(str(tmp_path / "images"), str(shard_directory))
+
+        # Assert
+        with tarfile.open(shard_directory / "shard-000000.tar") as shard:
+            members = shard.getmembers()
+            assert len(members) == 6
+            for member in members:
+                assert member.isreg()
+                assert member.size > 0
+
+    def test_write_shards_with_names_that_differ_only_in_dots_expect_different_keys(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "images" / "Flat")
+        for image_name in ["a.b.png", "a_b.png", "a%2Eb.png"]:
+            Image.new("L", (10, 10), 0).save(tmp_path / "images" / "Flat" / image_name)
+        shard_directory = tmp_path / "shards"
+
+        # Act
+        DatasetShardWriter().write_shards(str(tmp_path / "images"), str(shard_directory))
+
+        # Assert
+        with tarfile.open(shard_directory / "shard-000000.tar") as shard:
+            image_members = [name for name in shard.getnames() if name.endswith(".png")]
+        assert sorted(image_members) == ["Flat/a%252Eb.png", "Flat/a%2Eb.png", "Flat/a_b.png"]
@@ -0,0 +1,77 @@
+import os
+
+from PIL import Image
+
+from DatasetSplitter import DatasetSplitter
+
+
+def create_images(class_directory, number_of_images: int):
+    os.makedirs(class_directory)
+    for index in range(number_of_images):
+        Image.new("L", (10, 10), index).save(class_directory / "{0}.png".format(index))
+
+
+class DatasetSplitterTest:
+    def test_get_random_training_validation_and_test_sample_indices_expect_disjoint_reproducible_split(self):
+        # Arrange
+        dataset_splitter = DatasetSplitter("images", "images")
+
+        # Act
+        training, validation, test = dataset_splitter.get_random_training_validation_and_test_sample_indices(100)
+
+        # Assert
+        assert (len(training), len(validation), len(test)) == (80, 10, 10)
+        assert sorted(training + validation + test) == list(range(100))
+        assert (training, validation, test) == \
+               dataset_splitter.get_random_training_validation_and_test_sample_indices(100)
+
+    def test_split_images_expect_split_files_to_be_hard_links_to_the_source_files(self, tmp_path):
+        # Arrange
+        create_images(tmp_path / "images" / "Flat", 10)
+        dataset_splitter = DatasetSplitter(str(tmp_path / "images"), str(tmp_path / "images"))
+
+        # Act
+        dataset_splitter.split_images_into_training_validation_and_test_set()
+
+        # Assert
+        split_files = [(name_of_split, file_name)
+                       for name_of_split in ["training", "validation", "test"]
+                       for file_name in os.listdir(tmp_path / "images" / name_of_split / "Flat")]
+        assert len(split_files) == 10
+        assert sorted(file_name for _, file_name in split_files) == sorted(os.listdir(tmp_path / "images" / "Flat"))
+        for name_of_split, file_name in split_files:
+            assert os.path.samefile(tmp_path / "images" / name_of_split / "Flat" / file_name,
+                                    tmp_path / "images" / "Flat" / file_name)
+
+    def test_split_images_twice_expect_split_directories_to_be_recreated(self, tmp_path):
+        # Arrange
+        create_images(tmp_path / "images" / "Flat", 10)
+        dataset_splitter = DatasetSplitter(str(tmp_path / "images"), str(tmp_path / "images"))
+        dataset_splitter.delete_split_directories()
+        dataset_splitter.split_images_into_training_validation_and_test_set()
+        Image.new("L", (10, 10), 0).save(tmp_path / "images" / "training" / "Flat" / "stale.png")
+
+        # Act
+        dataset_splitter.delete_split_directories()
+        dataset_splitter.split_images_into_training_validation_and_test_set()
+
+        # Assert
+        assert sorted(os.listdir(tmp_path / "images")) == ["Flat", "test", "training", "validation"]
+        assert len(os.listdir(tmp_path / "images" / "training" / "Flat")) == 8
+        assert "stale.png" not in os.listdir(tmp_path / "images" / "training" / "Flat")
+
+    def test_split_images_with_existing_destination_expect_file_to_be_copied(self, tmp_path):
+        # Arrange
+        create_images(tmp_path / "images" / "Flat", 1)
+        os.makedirs(tmp_path / "split" / "training" / "Flat")
+        Image.new("L", (10, 10), 255).save(tmp_path / "split" / "training" / "Flat" / "0.png")
+        dataset_splitter = DatasetSplitter(str(tmp_path / "images"), str(tmp_path / "split"))
+
+        # Act
+        dataset_splitter.split_images_into_training_validation_and_test_set()
+
+        # Assert
+        destination_path = tmp_path / "split" / "training" / "Flat" / "0.png"
+        assert not os.path.samefile(destination_path, tmp_path / "images" / "Flat" / "0.png")
+        with open(destination_path, "rb") as destination, open(tmp_path / "images" / "Flat" / "0.png", "rb") as source:
+            assert destination.read() == source.read()
@@ -0,0 +1,40 @@
+import os
+
+from PIL import Image
+
+from DuplicateImageLinker import DuplicateImageLinker
+
+
+class DuplicateImageLinkerTest:
+    def test_link_duplicate_images_expect_identical_images_to_be_hard_linked(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "Flat")
+        os.makedirs(tmp_path / "Sharp")
+        Image.new("L", (10, 10), 0).save(tmp_path / "Flat" / "1.png")
+        Image.new("L", (10, 10), 0).save(tmp_path / "Flat" / "2.png")
+        Image.new("L", (10, 10), 0).save(tmp_path / "Sharp" / "1.png")
+        Image.new("L", (10, 10), 255).save(tmp_path / "Sharp" / "2.png")
+
+        # Act
+        number_of_linked_images = DuplicateImageLinker().link_duplicate_images(str(tmp_path))
+
+        # Assert
+        assert number_of_linked_images == 2
+        assert os.path.samefile(tmp_path / "Flat" / "1.png", tmp_path / "Flat" / "2.png")
+        assert os.path.samefile(tmp_path / "Flat" / "1.png", tmp_path / "Sharp" / "1.png")
+        assert os.stat(tmp_path / "Flat" / "1.png").st_nlink == 3
+        assert os.stat(tmp_path / "Sharp" / "2.png").st_nlink == 1
+        assert sorted(os.listdir(tmp_path / "Flat")) == ["1.png", "2.png"]
+
+    def test_link_duplicate_images_twice_expect_already_linked_images_to_be_skipped(self, tmp_path):
+        # Arrange
+        Image.new("L", (10, 10), 0).save(tmp_path / "1.png")
+        Image.new("L", (10, 10), 0).save(tmp_path / "2.png")
+        DuplicateImageLinker().link_duplicate_images(str(tmp_path))
+
+        # Act
+        number_of_linked_images = DuplicateImageLinker().link_duplicate_images(str(tmp_path))
+
+        # Assert
+        assert number_of_linked_images == 0
+        assert os.path.samefile(tmp_path / "1.png", tmp_path / "2.png")
@@ -0,0 +1,38 @@
+import os
+
+from PIL import Image
+
+from GpuImageResizer import GpuImageResizer
+
+
+class GpuImageResizerTest:
+    def test_resize_all_images_expect_images_with_target_size_in_rgb(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "Flat")
+        Image.new("L", (10, 20), 0).save(tmp_path / "Flat" / "0.png")
+        Image.new("L", (10, 20), 255).save(tmp_path / "Flat" / "1.png")
+        Image.new("RGB", (30, 5), (255, 0, 0)).save(tmp_path / "Flat" / "2.png")
+        os.link(tmp_path / "Flat" / "0.png", tmp_path / "Flat" / "3.png")
+
+        # Act
+        GpuImageResizer().resize_all_images(str(tmp_path), 8, 6, batch_size=2)
+
+        # Assert
+        for image_name in ["0.png", "1.png", "2.png", "3.png"]:
+            with Image.open(tmp_path / "Flat" / image_name) as image:
+                assert image.size == (8, 6)
+                assert image.mode == "RGB"
+        assert Image.open(tmp_path / "Flat" / "1.png").getpixel((4, 3)) == (255, 255, 255)
+        assert os.path.samefile(tmp_path / "Flat" / "0.png", tmp_path / "Flat" / "3.png")
+
+    def test_resize_all_images_with_target_size_expect_image_to_be_left_untouched(self, tmp_path):
+        # Arrange
+        Image.new("L", (8, 6), 0).save(tmp_path / "0.png")
+        os.utime(tmp_path / "0.png", (0, 0))
+
+        # Act
+        GpuImageResizer().resize_all_images(str(tmp_path), 8, 6)
+
+        # Assert
+        assert os.stat(tmp_path / "0.png").st_mtime == 0
+        assert Image.open(tmp_path / "0.png").mode == "L"
@@ -0,0 +1,77 @@
+import os
+
+from PIL import Image
+
+from ImageResizer import ImageResizer
+
+
+class ImageResizerTest:
+    def test_find_all_images_with_hard_links_expect_each_file_to_be_returned_once(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "Flat")
+        os.makedirs(tmp_path / "training" / "Flat")
+        Image.new("L", (10, 10), 0).save(tmp_path / "Flat" / "0.png")
+        Image.new("L", (10, 10), 0).save(tmp_path / "Flat" / "1.png")
+        os.link(tmp_path / "Flat" / "0.png", tmp_path / "training" / "Flat" / "0.png")
+        (tmp_path / "Flat" / "readme.txt").write_text("not an image")
+
+        # Act
+        all_images = ImageResizer().find_all_images(str(tmp_path))
+
+        # Assert
+        assert len(all_images) == 2
+        assert len(set(os.stat(image_path).st_ino for image_path in all_images)) == 2
+
+    def test_resize_all_images_with_hard_links_expect_all_links_to_be_resized(self, tmp_path):
+        # Arrange
+        Image.new("L", (10, 20), 0).save(tmp_path / "0.png")
+        os.link(tmp_path / "0.png", tmp_path / "1.png")
+
+        # Act
+        ImageResizer().resize_all_images(str(tmp_path), 8, 6, Image.LANCZOS)
+
+        # Assert
+        assert Image.open(tmp_path / "0.png").size == (8, 6)
+        assert os.path.samefile(tmp_path / "0.png", tmp_path / "1.png")
+
+    def test_resize_image_into_expect_destination_with_target_size_and_unchanged_source(self, tmp_path):
+        # Arrange
+        Image.new("L", (10, 20), 0).save(tmp_path / "source.png")
+
+        # Act
+        ImageResizer().resize_image_into(str(tmp_path / "source.png"), str(tmp_path / "destination.png"), 8, 6,
+                                         Image.LANCZOS)
+
+        # Assert
+        assert Image.open(tmp_path / "destination.png").size == (8, 6)
+        assert Image.open(tmp_path / "destination.png").mode == "RGB"
+        assert Image.open(tmp_path / "source.png").size == (10, 20)
+
+    def test_resize_image_into_with_target_size_expect_re_encoded_copy(self, tmp_path):
+        # Arrange
+        Image.new("L", (8, 6), 0).save(tmp_path / "source.png", compress_level=0)
+
+        # Act
+        ImageResizer().resize_image_into(str(tmp_path / "source.png"), str(tmp_path / "destination.png"), 8, 6,
+                                         Image.LANCZOS)
+
+        # Assert
+        assert Image.open(tmp_path / "destination.png").size == (8, 6)
+        assert os.path.getsize(tmp_path / "destination.png") < os.path.getsize(tmp_path / "source.png")
+
+    def test_resize_all_images_into_expect_resized_images_and_copied_other_files(self, tmp_path):
+        # Arrange
+        os.makedirs(tmp_path / "source")
+        Image.new("L", (10, 20), 0).save(tmp_path / "source" / "0.png")
+        Image.new("RGB", (30, 5), (0, 0, 0)).save(tmp_path / "source" / "1.png")
+        (tmp_path / "source" / "readme.txt").write_text("not an image")
+
+        # Act
+        ImageResizer().resize_all_images_into(str(tmp_path / "source"), str(tmp_path / "destination"), 8, 6,
+                                              Image.LANCZOS)
+
+        # Assert
+        assert sorted(os.listdir(tmp_path / "destination")) == ["0.png", "1.png", "readme.txt"]
+        assert Image.open(tmp_path / "destination" / "0.png").size == (8, 6)
+        assert Image.open(tmp_path / "destination" / "1.png").size == (8, 6)
+        assert (tmp_path / "destination" / "readme.txt").read_text() == "not an image"
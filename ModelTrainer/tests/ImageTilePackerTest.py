@@ -0,0 +1,51 @@
+import json
+import os
+
+import numpy
+from PIL import Image
+
+from ImageTilePacker import ImageTilePacker
+
+
+class ImageTilePackerTest:
+    def test_pack_images_into_tiles_expect_index_with_positions_of_images(self, tmp_path):
+        # Arrange
+        class_directory = tmp_path / "images" / "Flat"
+        os.makedirs(class_directory)
+        for index in range(5):
+            Image.new("L", (10, 20), index * 50).save(class_directory / "{0}.png".format(index))
+        tile_directory = tmp_path / "tiles"
+
+        # Act
+        ImageTilePacker().pack_images_into_tiles(str(tmp_path / "images"), str(tile_directory), 10, 20,
+                                                 tile_rows=2, tile_columns=2)
+
+        # Assert
+        assert sorted(os.listdir(tile_directory / "Flat")) == ["tile-00000.json", "tile-00000.png",
+                                                               "tile-00001.json", "tile-00001.png"]
+        with open(tile_directory / "Flat" / "tile-00000.json") as file:
+            tile_index = json.load(file)
+        assert [(entry["file_name"], entry["x"], entry["y"]) for entry in tile_index] == \
+               [("0.png", 0, 0), ("1.png", 10, 0), ("2.png", 0, 20), ("3.png", 10, 20)]
+
+        tile = numpy.asarray(Image.open(tile_directory / "Flat" / "tile-00000.png"))
+        assert tile.shape == (40, 20, 3)
+        for entry, expected_value in zip(tile_index, [0, 50, 100, 150]):
+            sub_image = tile[entry["y"]:entry["y"] + entry["height"], entry["x"]:entry["x"] + entry["width"]]
+            assert numpy.all(sub_image == expected_value)
+
+    def test_pack_images_into_tiles_expect_unused_positions_of_last_tile_to_be_white(self, tmp_path):
+        # Arrange
+        class_directory = tmp_path / "images" / "Flat"
+        os.makedirs(class_directory)
+        Image.new("L", (10, 10), 0).save(class_directory / "0.png")
+
+        # Act
+        ImageTilePacker().pack_images_into_tiles(str(tmp_path / "images"), str(tmp_path / "tiles"), 10, 10,
+                                                 tile_rows=2, tile_columns=2)
+
+        # Assert
+        tile = numpy.asarray(Image.open(tmp_path / "tiles" / "Flat" / "tile-00000.png"))
+        assert numpy.all(tile[:10, :10] == 0)
+        assert numpy.all(tile[:10, 10:] == 255)
+        assert numpy.all(tile[10:, :] == 255)
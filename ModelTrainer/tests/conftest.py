@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules inside of the datasets directory import each other by their plain module name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "datasets"))